@@ -1,14 +1,16 @@
+import atexit
 import calendar as cal
 import datetime as dt
 import math
-import random
+import secrets
 import shutil
-import string
+import threading
 import tkinter as tk
+from functools import lru_cache
 from pathlib import Path
 from tkinter import filedialog, messagebox, ttk
 
-from ledger import LedgerStore
+from ledger import LedgerStore, parse_iso_date, write_json
 
 IOS_COLORS = {
     "background": "#F2F2F7",
@@ -33,6 +35,160 @@ NAV_ITEMS = [
     ("security", "安全设置"),
 ]
 
+CALENDAR_CELL_WIDTH = 48
+CALENDAR_CELL_HEIGHT = 36
+CALENDAR_HEADER_HEIGHT = 28
+CALENDAR_ROWS = 6
+WEEKDAY_NAMES = ("一", "二", "三", "四", "五", "六", "日")
+TYPE_LABELS = {"income": "收入", "expense": "支出"}
+AMOUNT_SIGNS = {"income": "+", "expense": "-"}
+
+FONT_REGULAR = ("SF Pro Text", 11)
+FONT_SMALL = ("SF Pro Text", 10)
+FONT_TITLE = ("SF Pro Display", 14, "bold")
+
+ENTRY_STYLE_OPTS = {
+    "fieldbackground": IOS_COLORS["surface_alt"],
+    "background": IOS_COLORS["surface_alt"],
+    "foreground": IOS_COLORS["text"],
+    "bordercolor": IOS_COLORS["border"],
+    "padding": (10, 6),
+}
+
+NAV_STYLE_OPTS = {
+    "foreground": IOS_COLORS["text"],
+    "padding": (16, 10),
+    "anchor": "w",
+}
+
+STYLE_SETTINGS = {
+    "Background.TFrame": {"configure": {"background": IOS_COLORS["background"]}},
+    "Sidebar.TFrame": {"configure": {"background": IOS_COLORS["surface"], "borderwidth": 0}},
+    "Card.TFrame": {"configure": {"background": IOS_COLORS["surface"], "relief": "flat", "borderwidth": 0}},
+    "CardBody.TFrame": {"configure": {"background": IOS_COLORS["surface"]}},
+    "CardTitle.TLabel": {
+        "configure": {"background": IOS_COLORS["surface"], "foreground": IOS_COLORS["text"], "font": FONT_TITLE},
+    },
+    "SidebarTitle.TLabel": {
+        "configure": {
+            "background": IOS_COLORS["surface"],
+            "foreground": IOS_COLORS["text"],
+            "font": ("SF Pro Display", 18, "bold"),
+        },
+    },
+    "TLabel": {
+        "configure": {"background": IOS_COLORS["surface"], "foreground": IOS_COLORS["text"], "font": FONT_REGULAR},
+    },
+    "Small.TLabel": {
+        "configure": {"background": IOS_COLORS["surface"], "foreground": IOS_COLORS["text_muted"], "font": FONT_SMALL},
+    },
+    "Summary.TLabel": {
+        "configure": {
+            "background": IOS_COLORS["surface"],
+            "foreground": IOS_COLORS["text_muted"],
+            "font": ("SF Pro Text", 11, "bold"),
+        },
+    },
+    "Modern.TEntry": {
+        "configure": ENTRY_STYLE_OPTS,
+        "map": {"fieldbackground": [("focus", IOS_COLORS["surface"])]},
+    },
+    "Modern.TCombobox": {
+        "configure": ENTRY_STYLE_OPTS | {"arrowsize": 12},
+        "map": {"fieldbackground": [("readonly", IOS_COLORS["surface_alt"])]},
+    },
+    "Accent.TButton": {
+        "configure": {
+            "background": IOS_COLORS["accent"],
+            "foreground": "#FFFFFF",
+            "borderwidth": 0,
+            "focusthickness": 0,
+            "padding": (18, 8),
+            "font": ("SF Pro Text", 11, "bold"),
+        },
+        "map": {"background": [("active", IOS_COLORS["accent_active"])]},
+    },
+    "Ghost.TButton": {
+        "configure": {
+            "background": IOS_COLORS["surface_alt"],
+            "foreground": IOS_COLORS["accent"],
+            "borderwidth": 1,
+            "bordercolor": IOS_COLORS["accent"],
+            "padding": (16, 8),
+            "focusthickness": 0,
+        },
+        "map": {"background": [("active", IOS_COLORS["accent_soft"])]},
+    },
+    "Nav.TButton": {
+        "configure": NAV_STYLE_OPTS | {"background": IOS_COLORS["surface"], "font": ("SF Pro Text", 12)},
+    },
+    "NavActive.TButton": {
+        "configure": NAV_STYLE_OPTS | {"background": IOS_COLORS["accent_active"], "font": ("SF Pro Text", 12, "bold")},
+    },
+    "Ledger.Treeview": {
+        "configure": {
+            "background": IOS_COLORS["surface"],
+            "fieldbackground": IOS_COLORS["surface"],
+            "foreground": IOS_COLORS["text"],
+            "rowheight": 36,
+            "bordercolor": IOS_COLORS["border"],
+            "font": FONT_REGULAR,
+        },
+        "map": {
+            "background": [("selected", IOS_COLORS["accent"])],
+            "foreground": [("selected", "#FFFFFF")],
+        },
+        "layout": [
+            ("Treeview.field", {"sticky": "nswe", "border": 1, "children": [
+                ("Treeview.padding", {"sticky": "nswe", "children": [
+                    ("Treeview.treearea", {"sticky": "nswe"}),
+                ]}),
+            ]}),
+        ],
+    },
+    "Ledger.Treeview.Heading": {
+        "configure": {
+            "background": IOS_COLORS["surface"],
+            "foreground": IOS_COLORS["text_muted"],
+            "font": ("SF Pro Text", 11, "bold"),
+            "relief": "flat",
+        },
+    },
+}
+
+# 交易表增量同步脚本：删除、新增、改值与重排合并为一次跨语言调用，
+# 行数据作为 Tcl 列表参数传入，无需转义
+TREE_SYNC_ROWS = """{tree removed inserted updated order reorder} {
+    if {[llength $removed]} {
+        $tree delete $removed
+    }
+    foreach {iid values} $inserted {
+        $tree insert {} end -id $iid -values $values
+    }
+    foreach {iid values} $updated {
+        $tree item $iid -values $values
+    }
+    if {$reorder} {
+        $tree children {} $order
+    }
+}"""
+
+
+@lru_cache(maxsize=256)
+def _monthrange(year: int, month: int) -> tuple[int, int]:
+    return cal.monthrange(year, month)
+
+
+@lru_cache(maxsize=1024)
+def _parse_input_date(value: str) -> dt.date:
+    """按原 strptime 格式解析输入日期，规范的 YYYY-MM-DD 走 fromisoformat."""
+    if len(value) == 10 and value[4] == "-" and value[7] == "-":
+        try:
+            return parse_iso_date(value)
+        except ValueError:
+            pass
+    return dt.datetime.strptime(value, "%Y-%m-%d").date()
+
 
 class LedgerApp(tk.Tk):
     """Tkinter 智能记账 Demo，采用类 iOS 卡片 UI，并提供侧边导航."""
@@ -50,9 +206,12 @@ class LedgerApp(tk.Tk):
         self.active_filters: dict | None = None
         self.current_action_record_id: str | None = None
         self.edit_form_vars: dict[str, tk.StringVar] | None = None
+        self.category_combos: list[tuple[ttk.Combobox, bool]] = []
+        self._category_names_cache: tuple[str, ...] | None = None
 
         self.pages: dict[str, ttk.Frame] = {}
         self.nav_items: dict[str, dict[str, object]] = {}
+        self.nav_canvas_keys: dict[str, str] = {}
         self.active_nav: str = "home"
 
         self.edit_window: tk.Toplevel | None = None
@@ -62,14 +221,40 @@ class LedgerApp(tk.Tk):
         self.calendar_target_var: tk.StringVar | None = None
         self.calendar_reference_date: dt.date = dt.date.today()
         self.calendar_month_label: ttk.Label | None = None
-        self.calendar_days_frame: ttk.Frame | None = None
+        self.calendar_canvas: tk.Canvas | None = None
+        self.calendar_cell_items: list[tuple[int, int]] = []
+        self.calendar_cell_days: list[int] = []
         self.theme_canvas: tk.Canvas | None = None
         self.theme_hover: bool = False
+        self.theme_rendered: tuple | None = None
+        self.theme_bg: dict[str, object] = {"bg_id": None}
+        self.round_images: dict[tuple[int, int, int, str], tk.PhotoImage] = {}
+        self._pending_redraws: dict[str, str] = {}
+        self.chart_signatures: dict[str, tuple] = {}
+        self.bar_items: list[tuple[int, int, int]] = []
+        self._redraw_pending: bool = False
+
+        self.data_loading: bool = False
+        self._persist_pending: bool = False
+        self._data_lock = threading.Lock()
+        self._loaded_data: LedgerStore | Exception | None = None
+        self._load_thread: threading.Thread | None = None
+        self._dirty = threading.Event()
+        self._persist_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._persist_payload: dict | None = None
+        self._persist_error: Exception | None = None
+        self._persist_queued: int = 0
+        self._persist_done: int = 0
+        self._persist_polling: bool = False
+        threading.Thread(target=self._persist_worker, daemon=True).start()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        atexit.register(self._write_pending_payload)
 
         self._setup_style()
-        self._load_default_data()
         self._build_variables()
         self._build_layout()
+        self._load_default_data()
 
         self.show_page("home")
         self.refresh_records()
@@ -82,95 +267,10 @@ class LedgerApp(tk.Tk):
         except tk.TclError:
             pass
 
-        self.font_regular = ("SF Pro Text", 11)
-        self.font_small = ("SF Pro Text", 10)
-        self.font_title = ("SF Pro Display", 14, "bold")
-
-        self.style.configure("Background.TFrame", background=IOS_COLORS["background"])
-        self.style.configure("Sidebar.TFrame", background=IOS_COLORS["surface"], borderwidth=0)
-        self.style.configure("Card.TFrame", background=IOS_COLORS["surface"], relief="flat", borderwidth=0)
-        self.style.configure("CardBody.TFrame", background=IOS_COLORS["surface"])
-        self.style.configure("CardTitle.TLabel", background=IOS_COLORS["surface"], foreground=IOS_COLORS["text"], font=self.font_title)
-        self.style.configure("SidebarTitle.TLabel", background=IOS_COLORS["surface"], foreground=IOS_COLORS["text"], font=("SF Pro Display", 18, "bold"))
-        self.style.configure("TLabel", background=IOS_COLORS["surface"], foreground=IOS_COLORS["text"], font=self.font_regular)
-        self.style.configure("Small.TLabel", background=IOS_COLORS["surface"], foreground=IOS_COLORS["text_muted"], font=self.font_small)
-        self.style.configure(
-            "Summary.TLabel",
-            background=IOS_COLORS["surface"],
-            foreground=IOS_COLORS["text_muted"],
-            font=("SF Pro Text", 11, "bold"),
-        )
-
-        entry_opts = {
-            "fieldbackground": IOS_COLORS["surface_alt"],
-            "background": IOS_COLORS["surface_alt"],
-            "foreground": IOS_COLORS["text"],
-            "bordercolor": IOS_COLORS["border"],
-            "padding": (10, 6),
-        }
-        self.style.configure("Modern.TEntry", **entry_opts)
-        self.style.map("Modern.TEntry", fieldbackground=[("focus", IOS_COLORS["surface"])])
-
-        combo_opts = entry_opts | {"arrowsize": 12}
-        self.style.configure("Modern.TCombobox", **combo_opts)
-        self.style.map("Modern.TCombobox", fieldbackground=[("readonly", IOS_COLORS["surface_alt"])])
-
-        self.style.configure(
-            "Accent.TButton",
-            background=IOS_COLORS["accent"],
-            foreground="#FFFFFF",
-            borderwidth=0,
-            focusthickness=0,
-            padding=(18, 8),
-            font=("SF Pro Text", 11, "bold"),
-        )
-        self.style.map("Accent.TButton", background=[("active", IOS_COLORS["accent_active"])])
-
-        self.style.configure(
-            "Ghost.TButton",
-            background=IOS_COLORS["surface_alt"],
-            foreground=IOS_COLORS["accent"],
-            borderwidth=1,
-            bordercolor=IOS_COLORS["accent"],
-            padding=(16, 8),
-            focusthickness=0,
-        )
-        self.style.map("Ghost.TButton", background=[("active", IOS_COLORS["accent_soft"])])
-
-        self.style.configure(
-            "Nav.TButton",
-            background=IOS_COLORS["surface"],
-            foreground=IOS_COLORS["text"],
-            font=("SF Pro Text", 12),
-            padding=(16, 10),
-            anchor="w",
-        )
-        self.style.configure(
-            "NavActive.TButton",
-            background=IOS_COLORS["accent_active"],
-            foreground=IOS_COLORS["text"],
-            font=("SF Pro Text", 12, "bold"),
-            padding=(16, 10),
-            anchor="w",
-        )
-
-        self.style.configure(
-            "Ledger.Treeview",
-            background=IOS_COLORS["surface"],
-            fieldbackground=IOS_COLORS["surface"],
-            foreground=IOS_COLORS["text"],
-            rowheight=36,
-            bordercolor=IOS_COLORS["border"],
-            font=self.font_regular,
-        )
-        self.style.configure(
-            "Ledger.Treeview.Heading",
-            background=IOS_COLORS["surface"],
-            foreground=IOS_COLORS["text_muted"],
-            font=("SF Pro Text", 11, "bold"),
-            relief="flat",
-        )
-        self.style.map("Ledger.Treeview", background=[("selected", IOS_COLORS["accent"])], foreground=[("selected", "#FFFFFF")])
+        self.font_regular = FONT_REGULAR
+        self.font_small = FONT_SMALL
+        self.font_title = FONT_TITLE
+        self.style.theme_settings(self.style.theme_use(), STYLE_SETTINGS)
 
     def _build_variables(self) -> None:
         today = dt.date.today().isoformat()
@@ -184,8 +284,6 @@ class LedgerApp(tk.Tk):
         self.search_category_var = tk.StringVar()
         self.search_min_var = tk.StringVar()
         self.search_max_var = tk.StringVar()
-
-        self.summary_text = tk.StringVar(value="收支汇总：收入 ¥0.00 / 支出 ¥0.00 / 结余 ¥0.00")
         self._reset_filter_defaults()
 
     def _build_layout(self) -> None:
@@ -206,14 +304,17 @@ class LedgerApp(tk.Tk):
         self.content = content
 
         self._build_home_page()
-        self._build_transactions_page()
-        self._build_analytics_page()
-        self._build_category_page()
-        self._build_security_page()
+        self._page_builders = {
+            "transactions": self._build_transactions_page,
+            "analytics": self._build_analytics_page,
+            "categories": self._build_category_page,
+            "security": self._build_security_page,
+        }
 
     def _build_sidebar(self, parent: ttk.Frame) -> None:
         parent.columnconfigure(0, weight=1)
         ttk.Label(parent, text="智能记账本系统", style="SidebarTitle.TLabel").grid(row=0, column=0, sticky="w", pady=(0, 24))
+        placements = []
         for idx, (key, label) in enumerate(NAV_ITEMS, start=1):
             canvas = tk.Canvas(
                 parent,
@@ -223,7 +324,7 @@ class LedgerApp(tk.Tk):
                 bg=IOS_COLORS["surface"],
                 cursor="hand2",
             )
-            canvas.grid(row=idx, column=0, sticky="ew", pady=4)
+            placements.append(f"grid {canvas} -row {idx} -column 0 -sticky ew -pady 4")
             text_id = canvas.create_text(
                 32,
                 23,
@@ -232,12 +333,20 @@ class LedgerApp(tk.Tk):
                 font=("SF Pro Text", 12),
                 fill=IOS_COLORS["text"],
             )
-            self.nav_items[key] = {"canvas": canvas, "text": text_id, "hover": False}
-            canvas.bind("<Enter>", lambda _e, k=key: self._set_nav_hover(k, True))
-            canvas.bind("<Leave>", lambda _e, k=key: self._set_nav_hover(k, False))
-            canvas.bind("<Button-1>", lambda _e, k=key: self.show_page(k))
-            canvas.bind("<Configure>", lambda _e, k=key: self._render_nav_item(k))
-        parent.rowconfigure(len(NAV_ITEMS) + 1, weight=1)
+            self.nav_items[key] = {
+                "canvas": canvas,
+                "text": text_id,
+                "hover": False,
+                "rendered": None,
+                "bg_id": None,
+            }
+            canvas.bindtags(("NavCanvas",) + canvas.bindtags())
+            self.nav_canvas_keys[str(canvas)] = key
+        self.tk.eval("\n".join(placements))
+        self.bind_class("NavCanvas", "<Enter>", lambda e: self._on_nav_event(e, "enter"))
+        self.bind_class("NavCanvas", "<Leave>", lambda e: self._on_nav_event(e, "leave"))
+        self.bind_class("NavCanvas", "<Button-1>", lambda e: self._on_nav_event(e, "click"))
+        self.bind_class("NavCanvas", "<Configure>", lambda e: self._on_nav_event(e, "configure"))
 
         theme_canvas = tk.Canvas(
             parent,
@@ -261,9 +370,22 @@ class LedgerApp(tk.Tk):
         theme_canvas.bind("<Enter>", lambda _e: self._set_theme_hover(True))
         theme_canvas.bind("<Leave>", lambda _e: self._set_theme_hover(False))
         theme_canvas.bind("<Button-1>", lambda _e: self.show_toast("TODO - 该功能未完成"))
-        theme_canvas.bind("<Configure>", lambda _e: self._render_theme_toggle())
+        theme_canvas.bind("<Configure>", lambda _e: self._debounce("theme", self._render_theme_toggle))
         self._refresh_nav_styles()
 
+    def _on_nav_event(self, event: tk.Event, kind: str) -> None:
+        key = self.nav_canvas_keys.get(str(event.widget))
+        if not key:
+            return
+        if kind == "enter":
+            self._set_nav_hover(key, True)
+        elif kind == "leave":
+            self._set_nav_hover(key, False)
+        elif kind == "click":
+            self.show_page(key)
+        else:
+            self._debounce(f"nav:{key}", lambda: self._render_nav_item(key))
+
     def _set_nav_hover(self, key: str, hover: bool) -> None:
         item = self.nav_items.get(key)
         if not item or item["hover"] == hover:
@@ -276,9 +398,12 @@ class LedgerApp(tk.Tk):
         if not item:
             return
         canvas = item["canvas"]
-        canvas.delete("bg")
         width = canvas.winfo_width()
         height = canvas.winfo_height()
+        state = (width, height, item["hover"], key == self.active_nav)
+        if state == item["rendered"]:
+            return
+        item["rendered"] = state
         if width <= 0 or height <= 0:
             return
         color = None
@@ -286,9 +411,7 @@ class LedgerApp(tk.Tk):
             color = IOS_COLORS["text"]
         elif item["hover"]:
             color = IOS_COLORS["border"]
-        if color:
-            self._draw_round_rect(canvas, 8, 6, width - 8, height - 6, 16, fill=color, outline="", tags="bg")
-            canvas.tag_lower("bg")
+        self._update_round_bg(canvas, item, width, height, color)
         text_color = "#FFFFFF" if key == self.active_nav else IOS_COLORS["text"]
         canvas.itemconfig(item["text"], fill=text_color)
 
@@ -306,63 +429,57 @@ class LedgerApp(tk.Tk):
         if not self.theme_canvas:
             return
         canvas = self.theme_canvas
-        canvas.delete("bg")
         width = canvas.winfo_width()
         height = canvas.winfo_height()
-        if width <= 0 or height <= 0:
+        state = (width, height, self.theme_hover)
+        if state == self.theme_rendered:
             return
-        if self.theme_hover:
-            self._draw_round_rect(canvas, 8, 6, width - 8, height - 6, 16, fill=IOS_COLORS["surface_alt"], outline="", tags="bg")
-            canvas.tag_lower("bg")
-
-    def _draw_round_rect(
-        self,
-        canvas: tk.Canvas,
-        x1: float,
-        y1: float,
-        x2: float,
-        y2: float,
-        radius: float,
-        **kwargs,
-    ) -> None:
-        if x2 <= x1 or y2 <= y1:
+        self.theme_rendered = state
+        if width <= 0 or height <= 0:
             return
-        points = [
-            x1 + radius,
-            y1,
-            x2 - radius,
-            y1,
-            x2,
-            y1,
-            x2,
-            y1 + radius,
-            x2,
-            y2 - radius,
-            x2,
-            y2,
-            x2 - radius,
-            y2,
-            x1 + radius,
-            y2,
-            x1,
-            y2,
-            x1,
-            y2 - radius,
-            x1,
-            y1 + radius,
-            x1,
-            y1,
-        ]
-        canvas.create_polygon(points, smooth=True, splinesteps=36, **kwargs)
+        color = IOS_COLORS["surface_alt"] if self.theme_hover else None
+        self._update_round_bg(canvas, self.theme_bg, width, height, color)
+
+    def _update_round_bg(self, canvas: tk.Canvas, item: dict, width: int, height: int, color: str | None) -> None:
+        if item["bg_id"] is None:
+            item["bg_id"] = canvas.create_image(8, 6, anchor="nw", state="hidden")
+            canvas.tag_lower(item["bg_id"])
+        if color and width > 16 and height > 12:
+            image = self._round_rect_image(width - 16, height - 12, 16, color)
+            canvas.itemconfigure(item["bg_id"], image=image, state="normal")
+        else:
+            canvas.itemconfigure(item["bg_id"], state="hidden")
+
+    def _round_rect_image(self, width: int, height: int, radius: int, color: str) -> tk.PhotoImage:
+        key = (width, height, radius, color)
+        image = self.round_images.get(key)
+        if image is None:
+            image = tk.PhotoImage(master=self, width=width, height=height)
+            radius = min(radius, width // 2, height // 2)
+            image.put(color, to=(0, radius, width, height - radius))
+            for y in range(radius):
+                dy = radius - y - 0.5
+                inset = radius - int(math.sqrt(radius * radius - dy * dy) + 0.5)
+                image.put(color, to=(inset, y, width - inset, y + 1))
+                image.put(color, to=(inset, height - y - 1, width - inset, height - y))
+            self.round_images[key] = image
+        return image
+
+    def _debounce(self, key: str, callback) -> None:
+        pending = self._pending_redraws.pop(key, None)
+        if pending:
+            self.after_cancel(pending)
+        self._pending_redraws[key] = self.after(16, lambda: self._run_debounced(key, callback))
+
+    def _run_debounced(self, key: str, callback) -> None:
+        self._pending_redraws.pop(key, None)
+        callback()
 
     def _center_popup(self, window: tk.Toplevel) -> None:
-        self.update_idletasks()
+        # 弹窗尚未映射时 winfo_width 恒为 1，改用请求尺寸
         window.update_idletasks()
-        width = window.winfo_width()
-        height = window.winfo_height()
-        if width <= 0 or height <= 0:
-            width = 300
-            height = 200
+        width = window.winfo_reqwidth() or 300
+        height = window.winfo_reqheight() or 200
         x = self.winfo_rootx() + (self.winfo_width() - width) // 2
         y = self.winfo_rooty() + (self.winfo_height() - height) // 2
         window.geometry(f"+{x}+{y}")
@@ -401,12 +518,6 @@ class LedgerApp(tk.Tk):
         page.rowconfigure(1, weight=10)
         self.pages["analytics"] = page
 
-        self.analytics_summary_vars = {
-            "income": tk.StringVar(value="¥0.00"),
-            "expense": tk.StringVar(value="¥0.00"),
-            "balance": tk.StringVar(value="¥0.00"),
-        }
-
         summary_frame = ttk.Frame(page, style="Background.TFrame")
         summary_frame.grid(row=0, column=0, sticky="nsew", pady=(0, 30))
         summary_frame.rowconfigure(0, weight=1)
@@ -417,6 +528,7 @@ class LedgerApp(tk.Tk):
             ("expense", "总支出"),
             ("balance", "结余"),
         ]
+        analytics_labels: dict[str, ttk.Label] = {}
         for idx, (key, title) in enumerate(summary_labels):
             card = self._create_card(
                 summary_frame,
@@ -426,13 +538,16 @@ class LedgerApp(tk.Tk):
                 sticky="nsew",
                 padx=(0 if idx == 0 else 30, 0),
             )
-            ttk.Label(
+            label = ttk.Label(
                 card,
-                textvariable=self.analytics_summary_vars[key],
+                text="¥0.00",
                 font=("SF Pro Display", 35, "bold"),
                 background=IOS_COLORS["surface"],
                 foreground=IOS_COLORS["text"],
-            ).pack(anchor="center", pady=12)
+            )
+            label.pack(anchor="center", pady=12)
+            analytics_labels[key] = label
+        self.analytics_labels = analytics_labels
 
         chart_card = self._create_card(page, "收支图表", row=1, column=0, sticky="nsew")
         chart_card.columnconfigure(0, weight=1)
@@ -441,11 +556,11 @@ class LedgerApp(tk.Tk):
 
         self.bar_canvas = tk.Canvas(chart_card, bg=IOS_COLORS["surface_alt"], height=150, highlightthickness=0)
         self.bar_canvas.grid(row=0, column=0, sticky="nsew", padx=(0, 60))
-        self.bar_canvas.bind("<Configure>", lambda _e: self.draw_bar_chart())
+        self.bar_canvas.bind("<Configure>", lambda _e: self._debounce("bar", self.draw_bar_chart))
 
         self.pie_canvas = tk.Canvas(chart_card, bg=IOS_COLORS["surface_alt"], height=150, highlightthickness=0)
         self.pie_canvas.grid(row=0, column=1, sticky="nsew")
-        self.pie_canvas.bind("<Configure>", lambda _e: self.draw_pie_chart())
+        self.pie_canvas.bind("<Configure>", lambda _e: self._debounce("pie", self.draw_pie_chart))
 
 
     def _build_security_page(self) -> None:
@@ -494,10 +609,11 @@ class LedgerApp(tk.Tk):
         self.category_combo = ttk.Combobox(
             parent,
             textvariable=self.category_var,
-            values=[name for name, _ in self.store.get_categories()],
+            values=self._category_names(),
             style="Modern.TCombobox",
         )
         self.category_combo.grid(row=1, column=1, sticky="ew", pady=4)
+        self.category_combos.append((self.category_combo, False))
 
         ttk.Label(parent, text="类型").grid(row=2, column=0, sticky="w")
         type_frame = ttk.Frame(parent, style="CardBody.TFrame")
@@ -563,10 +679,11 @@ class LedgerApp(tk.Tk):
         self.filter_category_combo = ttk.Combobox(
             parent,
             textvariable=self.search_category_var,
-            values=[""] + [name for name, _ in self.store.get_categories()],
+            values=("",) + self._category_names(),
             style="Modern.TCombobox",
         )
         self.filter_category_combo.grid(row=1, column=1, sticky="ew", pady=4)
+        self.category_combos.append((self.filter_category_combo, True))
 
         ttk.Label(parent, text="最低金额").grid(row=1, column=2, sticky="w")
         ttk.Entry(parent, textvariable=self.search_min_var, style="Modern.TEntry").grid(row=1, column=3, sticky="ew", pady=4)
@@ -653,8 +770,18 @@ class LedgerApp(tk.Tk):
             takefocus=0,
         ).grid(row=0, column=3, padx=(12, 0))
 
-        self.calendar_days_frame = ttk.Frame(container, style="Background.TFrame")
-        self.calendar_days_frame.grid(row=1, column=0, sticky="nsew", pady=(12, 0))
+        self.calendar_canvas = tk.Canvas(
+            container,
+            width=CALENDAR_CELL_WIDTH * 7,
+            height=CALENDAR_HEADER_HEIGHT + CALENDAR_CELL_HEIGHT * CALENDAR_ROWS,
+            bd=0,
+            highlightthickness=0,
+            bg=IOS_COLORS["background"],
+        )
+        self.calendar_canvas.grid(row=1, column=0, sticky="nsew", pady=(12, 0))
+        self.calendar_canvas.bind("<Button-1>", self._on_calendar_click)
+        self._draw_calendar_header()
+        self._build_calendar_grid()
 
         self._render_calendar_days()
         self._center_popup(window)
@@ -667,45 +794,92 @@ class LedgerApp(tk.Tk):
         month = self.calendar_reference_date.month + months
         year += (month - 1) // 12
         month = (month - 1) % 12 + 1
-        day = min(self.calendar_reference_date.day, cal.monthrange(year, month)[1])
+        day = min(self.calendar_reference_date.day, _monthrange(year, month)[1])
         self.calendar_reference_date = dt.date(year, month, day)
         self._render_calendar_days()
 
+    def _draw_calendar_header(self) -> None:
+        canvas = self.calendar_canvas
+        if not canvas:
+            return
+        for idx, name in enumerate(WEEKDAY_NAMES):
+            canvas.create_text(
+                idx * CALENDAR_CELL_WIDTH + CALENDAR_CELL_WIDTH / 2,
+                CALENDAR_HEADER_HEIGHT / 2,
+                text=name,
+                fill=IOS_COLORS["text_muted"],
+                font=self.font_small,
+            )
+
+    def _build_calendar_grid(self) -> None:
+        canvas = self.calendar_canvas
+        if not canvas:
+            return
+        self.calendar_cell_items = []
+        self.calendar_cell_days = []
+        for idx in range(7 * CALENDAR_ROWS):
+            row, col = divmod(idx, 7)
+            x0 = col * CALENDAR_CELL_WIDTH + 2
+            y0 = CALENDAR_HEADER_HEIGHT + row * CALENDAR_CELL_HEIGHT + 2
+            x1 = x0 + CALENDAR_CELL_WIDTH - 4
+            y1 = y0 + CALENDAR_CELL_HEIGHT - 4
+            rect_id = canvas.create_rectangle(
+                x0,
+                y0,
+                x1,
+                y1,
+                fill=IOS_COLORS["surface_alt"],
+                activefill=IOS_COLORS["accent_soft"],
+                outline=IOS_COLORS["accent"],
+                state="hidden",
+            )
+            # 文字设为 disabled，鼠标悬停时不会抢走底色的 active 状态
+            text_id = canvas.create_text(
+                (x0 + x1) / 2,
+                (y0 + y1) / 2,
+                text="",
+                fill=IOS_COLORS["accent"],
+                font=self.font_regular,
+                state="hidden",
+            )
+            self.calendar_cell_items.append((rect_id, text_id))
+
     def _render_calendar_days(self) -> None:
-        if not self.calendar_days_frame:
+        canvas = self.calendar_canvas
+        if not canvas:
             return
-        for child in self.calendar_days_frame.winfo_children():
-            child.destroy()
         if self.calendar_month_label:
             self.calendar_month_label.configure(text=self.calendar_reference_date.strftime("%Y年%m月"))
-        weekdays = ["一", "二", "三", "四", "五", "六", "日"]
-        for idx, name in enumerate(weekdays):
-            ttk.Label(
-                self.calendar_days_frame,
-                text=name,
-                style="Small.TLabel",
-                padding=4,
-            ).grid(row=0, column=idx, padx=2, pady=2)
         year = self.calendar_reference_date.year
         month = self.calendar_reference_date.month
-        first_weekday, days_in_month = cal.monthrange(year, month)
-        row = 1
-        col = first_weekday
-        for _ in range(first_weekday):
-            ttk.Label(self.calendar_days_frame, text="", style="Small.TLabel", padding=4).grid(row=row, column=_, padx=2, pady=2)
-        for day in range(1, days_in_month + 1):
-            ttk.Button(
-                self.calendar_days_frame,
-                text=str(day),
-                style="Ghost.TButton",
-                command=lambda d=day: self._select_calendar_day(d),
-                width=4,
-                takefocus=0,
-            ).grid(row=row, column=col, padx=2, pady=2)
-            col += 1
-            if col > 6:
-                col = 0
-                row += 1
+        first_weekday, days_in_month = _monthrange(year, month)
+        previous = self.calendar_cell_days or [0] * len(self.calendar_cell_items)
+        days = [
+            day if 1 <= day <= days_in_month else 0
+            for day in range(1 - first_weekday, len(self.calendar_cell_items) + 1 - first_weekday)
+        ]
+        for (rect_id, text_id), old, day in zip(self.calendar_cell_items, previous, days):
+            if day == old:
+                continue
+            if day:
+                if not old:
+                    canvas.itemconfigure(rect_id, state="normal")
+                canvas.itemconfigure(text_id, text=str(day), state="disabled")
+            else:
+                canvas.itemconfigure(rect_id, state="hidden")
+                canvas.itemconfigure(text_id, state="hidden")
+        self.calendar_cell_days = days
+
+    def _on_calendar_click(self, event: tk.Event) -> None:
+        if event.y < CALENDAR_HEADER_HEIGHT:
+            return
+        col = event.x // CALENDAR_CELL_WIDTH
+        row = (event.y - CALENDAR_HEADER_HEIGHT) // CALENDAR_CELL_HEIGHT
+        if not (0 <= col < 7 and 0 <= row < CALENDAR_ROWS):
+            return
+        idx = row * 7 + col
+        if idx < len(self.calendar_cell_days) and self.calendar_cell_days[idx]:
+            self._select_calendar_day(self.calendar_cell_days[idx])
 
     def _select_calendar_day(self, day: int) -> None:
         if not self.calendar_target_var:
@@ -727,7 +901,9 @@ class LedgerApp(tk.Tk):
         self.calendar_window = None
         self.calendar_target_var = None
         self.calendar_month_label = None
-        self.calendar_days_frame = None
+        self.calendar_canvas = None
+        self.calendar_cell_items = []
+        self.calendar_cell_days = []
 
     def _build_transaction_table(self, parent: ttk.Frame) -> None:
         parent.columnconfigure(0, weight=1)
@@ -748,16 +924,24 @@ class LedgerApp(tk.Tk):
 
         scrollbar = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=self.transaction_tree.yview)
         self.transaction_tree.configure(yscrollcommand=scrollbar.set)
+        self.transaction_scrollbar = scrollbar
+        self.tree_state: dict[str, tuple[str, ...]] = {}
         self.transaction_tree.grid(row=0, column=0, sticky="nsew")
         scrollbar.grid(row=0, column=1, sticky="ns")
 
         self.transaction_tree.bind("<<TreeviewSelect>>", self.on_tree_select)
         self.transaction_tree.bind("<Button-1>", self.on_tree_click)
 
-        ttk.Label(parent, textvariable=self.summary_text, style="Summary.TLabel").grid(row=1, column=0, columnspan=2, sticky="w", pady=(12, 0))
+        self.summary_label = ttk.Label(parent, text="收支汇总：收入 ¥0.00 / 支出 ¥0.00 / 结余 ¥0.00", style="Summary.TLabel")
+        self.summary_label.grid(row=1, column=0, columnspan=2, sticky="w", pady=(12, 0))
 
     # ---------- 页面切换 ----------
     def show_page(self, key: str) -> None:
+        builder = self._page_builders.pop(key, None)
+        if builder:
+            builder()
+            if key == "analytics":
+                self.update_analytics_summary()
         page = self.pages.get(key)
         if not page:
             return
@@ -765,15 +949,14 @@ class LedgerApp(tk.Tk):
         self.active_nav = key
         self._refresh_nav_styles()
         if key == "analytics":
-            self.draw_charts()
+            self._schedule_redraw()
         elif key == "transactions":
             self.refresh_records()
         if key == "categories":
             self.show_toast("TODO - 类别管理功能未完成")
 
     # ---------- 业务操作 ----------
-    def parse_date(self, value: str) -> dt.date:
-        return dt.datetime.strptime(value, "%Y-%m-%d").date()
+    parse_date = staticmethod(_parse_input_date)
 
     def save_record(self) -> None:
         try:
@@ -781,6 +964,9 @@ class LedgerApp(tk.Tk):
         except ValueError:
             messagebox.showerror("提示", "请输入合法金额")
             return
+        if not math.isfinite(amount):
+            messagebox.showerror("提示", "请输入合法金额")
+            return
         if amount < 0:
             messagebox.showwarning("提示", "金额必须大于等于 0")
             return
@@ -812,8 +998,8 @@ class LedgerApp(tk.Tk):
             )
         self.update_category_inputs()
         self.refresh_records()
-        if self.persist_data():
-            self.show_toast(f"{action}成功")
+        self.persist_data()
+        self.show_toast(f"{action}成功")
         self.reset_form()
         self.show_page("transactions")
 
@@ -888,7 +1074,7 @@ class LedgerApp(tk.Tk):
         ttk.Combobox(
             container,
             textvariable=self.edit_form_vars["category"],
-            values=[name for name, _ in self.store.get_categories()],
+            values=self._category_names(),
             style="Modern.TCombobox",
         ).grid(row=1, column=1, sticky="ew", pady=4)
 
@@ -942,6 +1128,9 @@ class LedgerApp(tk.Tk):
         except ValueError:
             messagebox.showerror("提示", "请输入合法金额")
             return
+        if not math.isfinite(amount):
+            messagebox.showerror("提示", "请输入合法金额")
+            return
         if amount < 0:
             messagebox.showwarning("提示", "金额必须大于等于 0")
             return
@@ -963,8 +1152,8 @@ class LedgerApp(tk.Tk):
         )
         self.update_category_inputs()
         self.refresh_records()
-        if self.persist_data():
-            self.show_toast("编辑成功")
+        self.persist_data()
+        self.show_toast("编辑成功")
         self._close_edit_window()
 
     def _close_edit_window(self) -> None:
@@ -980,16 +1169,20 @@ class LedgerApp(tk.Tk):
             self.store.delete_record(self.current_action_record_id)
             self.refresh_records()
             self.reset_form()
-            if self.persist_data():
-                self.show_toast("删除成功")
+            self.persist_data()
+            self.show_toast("删除成功")
 
     def perform_search(self) -> None:
         filters: dict = {}
+        start_text = self.search_start_var.get()
+        end_text = self.search_end_var.get()
+        min_text = self.search_min_var.get()
+        max_text = self.search_max_var.get()
         try:
-            if self.search_start_var.get():
-                filters["start_date"] = self.parse_date(self.search_start_var.get())
-            if self.search_end_var.get():
-                filters["end_date"] = self.parse_date(self.search_end_var.get())
+            if start_text:
+                filters["start_date"] = self.parse_date(start_text)
+            if end_text:
+                filters["end_date"] = self.parse_date(end_text)
         except ValueError:
             messagebox.showerror("提示", "搜索日期格式需为 YYYY-MM-DD")
             return
@@ -997,10 +1190,10 @@ class LedgerApp(tk.Tk):
         if category:
             filters["category"] = category
         try:
-            if self.search_min_var.get():
-                filters["min_amount"] = float(self.search_min_var.get())
-            if self.search_max_var.get():
-                filters["max_amount"] = float(self.search_max_var.get())
+            if min_text:
+                filters["min_amount"] = float(min_text)
+            if max_text:
+                filters["max_amount"] = float(max_text)
         except ValueError:
             messagebox.showerror("提示", "金额筛选请输入数字")
             return
@@ -1016,52 +1209,106 @@ class LedgerApp(tk.Tk):
     def refresh_records(self, filters: dict | None = None) -> None:
         if filters is not None:
             self.active_filters = filters if filters else None
-        records = self.store.search_records(**(self.active_filters or {}))
         if not hasattr(self, "transaction_tree"):
+            self.update_analytics_summary()
+            self._schedule_redraw()
             return
-        for row in self.transaction_tree.get_children():
-            self.transaction_tree.delete(row)
+        records = self.store.search_records(**(self.active_filters or {}))
+        rows: dict[str, tuple[str, ...]] = {}
+        income = expense = 0.0
+        date_texts: dict[dt.date, str] = {}
         for record in records:
-            display_amount = f"{record.amount:.2f}"
-            if record.category_type == "expense":
-                display_amount = f"-{display_amount}"
-            else:
-                display_amount = f"+{display_amount}"
-            self.transaction_tree.insert(
-                "",
-                tk.END,
-                iid=record.id,
-                values=(
-                    record.date.isoformat(),
-                    record.category,
-                    "收入" if record.category_type == "income" else "支出",
-                    display_amount,
-                    "...",
-                ),
+            category_type = record.category_type
+            if category_type == "expense":
+                expense += record.amount
+            elif category_type == "income":
+                income += record.amount
+            date_text = date_texts.get(record.date)
+            if date_text is None:
+                date_text = date_texts[record.date] = record.date.isoformat()
+            rows[record.id] = (
+                date_text,
+                record.category,
+                TYPE_LABELS.get(category_type, "支出"),
+                f"{AMOUNT_SIGNS.get(category_type, '+')}{record.amount:.2f}",
+                "...",
             )
-        income = sum(r.amount for r in records if r.category_type == "income")
-        expense = sum(r.amount for r in records if r.category_type == "expense")
+        self._sync_rows(rows)
         balance = income - expense
-        self.summary_text.set(
-            f"收支汇总：收入 ¥{income:.2f} / 支出 ¥{expense:.2f} / 结余 ¥{balance:.2f}"
+        self.summary_label.configure(
+            text=f"收支汇总：收入 ¥{income:.2f} / 支出 ¥{expense:.2f} / 结余 ¥{balance:.2f}"
         )
-        self.update_analytics_summary()
-        self.draw_charts()
+        totals = None if self.active_filters else {"income": income, "expense": expense, "balance": balance}
+        self.update_analytics_summary(totals)
+        self._schedule_redraw()
+
+    def _sync_rows(self, wanted: dict[str, tuple[str, ...]]) -> None:
+        """以记录 id 为行 id，与已显示的行比对后只提交差异."""
+        state = self.tree_state
+        if not state:
+            self.tree_state = wanted
+            if wanted:
+                self._apply_tree_sync((), tuple(item for pair in wanted.items() for item in pair), (), (), False)
+            return
+        removed = [iid for iid in state if iid not in wanted]
+        inserted: list = []
+        updated: list = []
+        for iid, values in wanted.items():
+            shown = state.get(iid)
+            if shown is None:
+                inserted.extend((iid, values))
+            elif shown != values:
+                updated.extend((iid, values))
+        order = list(wanted)
+        current = [iid for iid in state if iid in wanted] + inserted[::2]
+        reorder = current != order
+        self.tree_state = wanted
+        if not (removed or inserted or updated or reorder):
+            return
+        self._apply_tree_sync(tuple(removed), tuple(inserted), tuple(updated), tuple(order), reorder)
+
+    def _apply_tree_sync(
+        self, removed: tuple, inserted: tuple, updated: tuple, order: tuple, reorder: bool
+    ) -> None:
+        tree = self.transaction_tree
+        tree.configure(yscrollcommand="")
+        self.tk.call("apply", TREE_SYNC_ROWS, str(tree), removed, inserted, updated, order, int(reorder))
+        tree.configure(yscrollcommand=self.transaction_scrollbar.set)
 
     # ---------- 图表 ----------
+    def _schedule_redraw(self) -> None:
+        if self._redraw_pending:
+            return
+        self._redraw_pending = True
+        self.after_idle(self._do_redraw)
+
+    def _do_redraw(self) -> None:
+        self._redraw_pending = False
+        self.draw_charts()
+
     def draw_charts(self) -> None:
         if hasattr(self, "bar_canvas"):
             self.draw_bar_chart()
         if hasattr(self, "pie_canvas"):
             self.draw_pie_chart()
 
+    def _chart_unchanged(self, key: str, signature: tuple) -> bool:
+        if self.chart_signatures.get(key) == signature:
+            return True
+        self.chart_signatures[key] = signature
+        return False
+
     def draw_bar_chart(self) -> None:
-        self.bar_canvas.delete("all")
         data = self.store.monthly_trend(12)
-        width = max(int(self.bar_canvas.winfo_width()), 320)
-        height = max(int(self.bar_canvas.winfo_height()), 220)
+        canvas = self.bar_canvas
+        width = max(int(canvas.winfo_width()), 320)
+        height = max(int(canvas.winfo_height()), 220)
+        if self._chart_unchanged("bar", (width, height, tuple(data))):
+            return
         if not data:
-            self.bar_canvas.create_text(
+            canvas.delete("all")
+            self.bar_items = []
+            canvas.create_text(
                 width / 2,
                 height / 2,
                 text="暂无数据",
@@ -1069,19 +1316,26 @@ class LedgerApp(tk.Tk):
                 font=self.font_regular,
             )
             return
+        reuse = len(self.bar_items) == len(data)
+        if reuse:
+            canvas.delete("guide")
+        else:
+            canvas.delete("all")
+            self.bar_items = []
         values = [abs(amount) for _, amount in data]
         max_value = max(values) or 1
         padding = 15
         bar_width = (width - padding * 2) / len(data) * 1.0
         mid_y = height / 2
         max_bar_height = (height - padding * 2) * 0.13
-        self.bar_canvas.create_line(
+        canvas.create_line(
             padding,
             mid_y,
             width - padding,
             mid_y,
             fill=IOS_COLORS["border"],
             width=1.2,
+            tags="guide",
         )
         unit = 1000
         guide_color = "#D7DBE7"
@@ -1092,39 +1346,45 @@ class LedgerApp(tk.Tk):
                 offset = (level / max_value) * max_bar_height
                 y_up = mid_y - offset
                 y_down = mid_y + offset
-                self.bar_canvas.create_line(
+                canvas.create_line(
                     padding,
                     y_up,
                     width - padding,
                     y_up,
                     fill=guide_color,
                     dash=(3, 4),
+                    tags="guide",
                 )
-                self.bar_canvas.create_line(
+                canvas.create_line(
                     padding,
                     y_down,
                     width - padding,
                     y_down,
                     fill=guide_color,
                     dash=(3, 4),
+                    tags="guide",
                 )
-                self.bar_canvas.create_text(
+                canvas.create_text(
                     padding + 4,
                     y_up - 6,
                     text=f"+{level}",
                     anchor="w",
                     fill=IOS_COLORS["text_muted"],
                     font=self.font_small,
+                    tags="guide",
                 )
-                self.bar_canvas.create_text(
+                canvas.create_text(
                     padding + 4,
                     y_down + 6,
                     text=f"-{level}",
                     anchor="w",
                     fill=IOS_COLORS["text_muted"],
                     font=self.font_small,
+                    tags="guide",
                 )
                 level += unit
+        if reuse:
+            canvas.tag_lower("guide")
 
         for idx, (label, amount) in enumerate(data):
             x0 = padding + idx * bar_width + 5
@@ -1140,28 +1400,41 @@ class LedgerApp(tk.Tk):
                 y1 = mid_y + bar_height
                 color = IOS_COLORS["danger"]
                 label_y = y1 + 12
-            self.bar_canvas.create_rectangle(x0, y0, x1, y1, fill=color, width=0, outline=color)
-            self.bar_canvas.create_text(
-                (x0 + x1) / 2,
+            center_x = (x0 + x1) / 2
+            if reuse:
+                rect_id, month_id, value_id = self.bar_items[idx]
+                canvas.coords(rect_id, x0, y0, x1, y1)
+                canvas.itemconfigure(rect_id, fill=color, outline=color)
+                canvas.coords(month_id, center_x, mid_y + 18)
+                canvas.itemconfigure(month_id, text=label)
+                canvas.coords(value_id, center_x, label_y)
+                canvas.itemconfigure(value_id, text=f"{amount:.0f}")
+                continue
+            rect_id = canvas.create_rectangle(x0, y0, x1, y1, fill=color, width=0, outline=color)
+            month_id = canvas.create_text(
+                center_x,
                 mid_y + 18,
                 text=label,
                 angle=45,
                 fill=IOS_COLORS["text_muted"],
                 font=self.font_small,
             )
-            self.bar_canvas.create_text(
-                (x0 + x1) / 2,
+            value_id = canvas.create_text(
+                center_x,
                 label_y,
                 text=f"{amount:.0f}",
                 fill=IOS_COLORS["text"],
                 font=self.font_small,
             )
+            self.bar_items.append((rect_id, month_id, value_id))
 
     def draw_pie_chart(self) -> None:
-        self.pie_canvas.delete("all")
         data = self.store.current_month_breakdown("expense")
         width = max(int(self.pie_canvas.winfo_width()), 320)
         height = max(int(self.pie_canvas.winfo_height()), 220)
+        if self._chart_unchanged("pie", (width, height, tuple(data))):
+            return
+        self.pie_canvas.delete("all")
         center_x = width / 2
         center_y = height / 2
         radius = min(width, height) / 2 - 40
@@ -1240,6 +1513,7 @@ class LedgerApp(tk.Tk):
         if self.toast_window and self.toast_window.winfo_exists():
             self.toast_window.destroy()
         toast = tk.Toplevel(self)
+        toast.withdraw()
         toast.overrideredirect(True)
         toast.attributes("-topmost", True)
         toast_bg = "#3C3C43"
@@ -1250,18 +1524,19 @@ class LedgerApp(tk.Tk):
         self.toast_window = toast
         self.toast_alpha = 0.9
         toast.attributes("-alpha", self.toast_alpha)
-        self._place_toast()
+        self.after_idle(self._place_toast, toast, frame)
         toast.after(2000, self._fade_toast_step)
 
-    def _place_toast(self) -> None:
-        if not self.toast_window:
+    def _place_toast(self, toast: tk.Toplevel, frame: tk.Frame) -> None:
+        if toast is not self.toast_window or not toast.winfo_exists():
             return
-        self.update_idletasks()
-        width = self.toast_window.winfo_reqwidth()
-        height = self.toast_window.winfo_reqheight()
+        # 内容框的请求尺寸在本轮空闲回调中已更新，顶层窗口要到下一轮才同步
+        width = frame.winfo_reqwidth()
+        height = frame.winfo_reqheight()
         x = self.winfo_rootx() + self.winfo_width() - width - 40
         y = self.winfo_rooty() + self.winfo_height() - height - 40
-        self.toast_window.geometry(f"+{x}+{y}")
+        toast.geometry(f"+{x}+{y}")
+        toast.deiconify()
 
     def _fade_toast_step(self) -> None:
         if not self.toast_window:
@@ -1276,42 +1551,140 @@ class LedgerApp(tk.Tk):
 
     # ---------- 数据同步 ----------
     def _load_default_data(self) -> None:
-        if self.data_file.exists():
-            try:
-                self.store.import_json(self.data_file)
-            except Exception as exc:
-                messagebox.showwarning("提示", f"加载默认数据失败：{exc}")
-        else:
+        if not self.data_file.exists():
             self.persist_data()
+            return
+        self.data_loading = True
+        self._load_thread = threading.Thread(target=self._load_default_data_bg, daemon=True)
+        self._load_thread.start()
+        self.after(20, self._poll_default_data)
 
-    def persist_data(self) -> bool:
+    def _load_default_data_bg(self) -> None:
+        store = LedgerStore()
         try:
-            self.store.export_json(self.data_file)
-            return True
+            store.import_json(self.data_file)
+            result: LedgerStore | Exception = store
         except Exception as exc:
+            result = exc
+        with self._data_lock:
+            self._loaded_data = result
+
+    def _poll_default_data(self) -> None:
+        with self._data_lock:
+            result, self._loaded_data = self._loaded_data, None
+        if result is None:
+            self.after(20, self._poll_default_data)
+            return
+        self.data_loading = False
+        if isinstance(result, Exception):
+            messagebox.showwarning("提示", f"加载默认数据失败：{result}")
+        else:
+            # 加载期间新增的记录原样并入（保留 id，界面仍可能持有它们）
+            for record in self.store.records:
+                result.insert_record(record)
+            self.store = result
+            self.update_category_inputs()
+            self.refresh_records()
+        if self._persist_pending:
+            self._persist_pending = False
+            self.persist_data()
+
+    def persist_data(self) -> None:
+        if self.data_loading:
+            # 文件尚未读完，此时写入会覆盖原有数据，待加载完成后再保存
+            self._persist_pending = True
+            return
+        with self._persist_lock:
+            self._persist_payload = self.store.export_payload()
+            self._persist_queued += 1
+        self._dirty.set()
+        if not self._persist_polling:
+            self._persist_polling = True
+            self.after(100, self._poll_persist)
+
+    def _persist_worker(self) -> None:
+        while True:
+            self._dirty.wait()
+            self._dirty.clear()
+            self._write_pending_payload()
+
+    def _write_pending_payload(self) -> None:
+        # 取快照与写盘都在写锁内，旧快照不会晚于新快照落盘
+        with self._write_lock:
+            with self._persist_lock:
+                payload, self._persist_payload = self._persist_payload, None
+                queued = self._persist_queued
+            if payload is None:
+                return
+            error = None
+            try:
+                write_json(self.data_file, payload)
+            except Exception as exc:
+                error = exc
+            with self._persist_lock:
+                if error is not None:
+                    self._persist_error = error
+                self._persist_done = queued
+
+    def _poll_persist(self) -> None:
+        with self._persist_lock:
+            finished = self._persist_done >= self._persist_queued
+        self._report_persist_error()
+        if finished:
+            self._persist_polling = False
+            return
+        self.after(100, self._poll_persist)
+
+    def _report_persist_error(self) -> None:
+        with self._persist_lock:
+            exc, self._persist_error = self._persist_error, None
+        if exc is not None:
             messagebox.showerror("错误", f"保存数据失败：{exc}")
-            return False
+
+    def _on_close(self) -> None:
+        if self.data_loading and self._load_thread is not None:
+            # 等待加载结束并合并加载期间保存的记录，否则它们会丢失
+            self._load_thread.join()
+            self._poll_default_data()
+        self._write_pending_payload()
+        self._report_persist_error()
+        self.destroy()
 
     def _generate_export_filename(self) -> str:
-        suffix = "".join(random.choices(string.ascii_uppercase + string.digits, k=6))
+        suffix = secrets.token_hex(3).upper()
         date_str = dt.date.today().strftime("%Y%m%d")
         return f"ledger-{date_str}-{suffix}.json"
 
-    def update_analytics_summary(self) -> None:
-        if not hasattr(self, "analytics_summary_vars"):
+    def update_analytics_summary(self, precomputed: dict[str, float] | None = None) -> None:
+        if not hasattr(self, "analytics_labels"):
             return
-        summary = self.store.summary()
-        self.analytics_summary_vars["income"].set(f"¥{summary['income']:.2f}")
-        self.analytics_summary_vars["expense"].set(f"¥{summary['expense']:.2f}")
-        self.analytics_summary_vars["balance"].set(f"¥{summary['balance']:.2f}")
+        summary = precomputed or self.store.summary()
+        for key, label in self.analytics_labels.items():
+            label.configure(text=f"¥{summary[key]:.2f}")
+
+    def _category_names(self) -> tuple[str, ...]:
+        if self._category_names_cache is None:
+            self._category_names_cache = tuple(name for name, _ in self.store.get_categories())
+        return self._category_names_cache
 
     def update_category_inputs(self) -> None:
-        values = [name for name, _ in self.store.get_categories()]
-        self.category_combo.configure(values=values)
-        if hasattr(self, "filter_category_combo"):
-            self.filter_category_combo.configure(values=[""] + values)
+        previous = self._category_names_cache
+        self._category_names_cache = None
+        values = self._category_names()
+        if values == previous:
+            return
+        for combo, with_blank in self.category_combos:
+            combo.configure(values=("",) + values if with_blank else values)
+
+    def _data_busy(self) -> bool:
+        if self.data_loading:
+            messagebox.showinfo("提示", "数据加载中，请稍后再试")
+            return True
+        return False
 
     def import_json(self) -> None:
+        if self._data_busy():
+            return
         path = filedialog.askopenfilename(filetypes=[("JSON 文件", "*.json")])
         if not path:
             return
@@ -1319,6 +1692,8 @@ class LedgerApp(tk.Tk):
             src = Path(path)
             self.store.import_json(src)
             if src.resolve() != self.data_file.resolve():
+                # 先写完排队中的旧快照，否则它会覆盖导入的文件
+                self._write_pending_payload()
                 shutil.copyfile(src, self.data_file)
             self.update_category_inputs()
             self.refresh_records()
@@ -1327,6 +1702,8 @@ class LedgerApp(tk.Tk):
             messagebox.showerror("错误", f"导入失败：{exc}")
 
     def export_json(self) -> None:
+        if self._data_busy():
+            return
         path = filedialog.asksaveasfilename(
             defaultextension=".json",
             filetypes=[("JSON 文件", "*.json")],
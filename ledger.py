@@ -2,15 +2,49 @@
 
 from __future__ import annotations
 
+import bisect
+import calendar
 import datetime as dt
 import json
+import math
+import os
+import tempfile
 import uuid
-from dataclasses import dataclass, asdict
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import DefaultDict, Dict, Iterable, List, Optional, Tuple
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时退回标准库
+    orjson = None
 
-@dataclass
+
+def _dumps(payload: Dict[str, list]) -> bytes:
+    # orjson 会把 NaN/Infinity 写成 null，读回时无法还原
+    if orjson is not None and all(math.isfinite(item["amount"]) for item in payload["records"]):
+        return orjson.dumps(payload, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(payload, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _loads(data: bytes) -> Dict[str, list]:
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # orjson 不接受 NaN，交给标准库
+    return json.loads(data)
+
+
+@lru_cache(maxsize=4096)
+def parse_iso_date(value: str) -> dt.date:
+    """解析 YYYY-MM-DD 日期."""
+    return dt.date.fromisoformat(value)
+
+
+@dataclass(slots=True)
 class Record:
     """单条记账记录."""
 
@@ -20,22 +54,31 @@ class Record:
     category_type: str  # income / expense
     date: dt.date
 
-    def to_dict(self) -> Dict[str, str]:
-        payload = asdict(self)
-        payload["date"] = self.date.isoformat()
-        return payload
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "id": self.id,
+            "amount": self.amount,
+            "category": self.category,
+            "category_type": self.category_type,
+            "date": self.date.isoformat(),
+        }
 
     @staticmethod
-    def from_dict(data: Dict[str, str]) -> "Record":
+    def from_dict(data: Dict[str, str], date: Optional[dt.date] = None) -> "Record":
         return Record(
             id=data.get("id") or str(uuid.uuid4()),
             amount=float(data["amount"]),
             category=data["category"],
             category_type=data.get("category_type", "expense"),
-            date=dt.date.fromisoformat(data["date"]),
+            date=date if date is not None else parse_iso_date(data["date"]),
         )
 
 
+def _date_sort_key(record: Record) -> int:
+    """LedgerStore.records 的排序键：日期越新越靠前."""
+    return -record.date.toordinal()
+
+
 DEFAULT_CATEGORIES: Tuple[Tuple[str, str], ...] = (
     ("工资", "income"),
     ("理财收益", "income"),
@@ -53,17 +96,27 @@ class LedgerStore:
 
     def __init__(self) -> None:
         self.records: List[Record] = []
+        self._by_id: Dict[str, Record] = {}
+        self._trend_cache: Dict[Tuple[int, int], List[Tuple[str, float]]] = {}
+        self._breakdown_cache: Dict[Tuple[int, str], List[Tuple[str, float]]] = {}
         self.categories: Dict[str, str] = {}
+        self._sorted_categories: Optional[List[Tuple[str, str]]] = None
         for name, ctype in DEFAULT_CATEGORIES:
             self.categories[name] = ctype
 
     def add_category(self, name: str, category_type: str) -> None:
         if not name:
             return
-        self.categories[name] = category_type or "expense"
+        category_type = category_type or "expense"
+        if self.categories.get(name) == category_type:
+            return
+        self.categories[name] = category_type
+        self._sorted_categories = None
 
     def get_categories(self) -> List[Tuple[str, str]]:
-        return sorted(self.categories.items())
+        if self._sorted_categories is None:
+            self._sorted_categories = sorted(self.categories.items())
+        return list(self._sorted_categories)
 
     def add_record(
         self,
@@ -79,10 +132,16 @@ class LedgerStore:
             category_type=category_type or self.categories.get(category, "expense"),
             date=date,
         )
-        self.records.append(record)
-        self.add_category(category, record.category_type)
+        self.insert_record(record)
         return record
 
+    def insert_record(self, record: Record) -> None:
+        """插入已有的记录对象，保留其 id."""
+        bisect.insort(self.records, record, key=_date_sort_key)
+        self._by_id[record.id] = record
+        self._invalidate_aggregates()
+        self.add_category(record.category, record.category_type)
+
     def update_record(
         self,
         record_id: str,
@@ -97,18 +156,47 @@ class LedgerStore:
         record.amount = float(amount)
         record.category = category
         record.category_type = category_type or self.categories.get(category, "expense")
-        record.date = date
+        if record.date != date:
+            del self.records[self._index_of(record)]
+            record.date = date
+            bisect.insort(self.records, record, key=_date_sort_key)
+        self._invalidate_aggregates()
         self.add_category(category, record.category_type)
         return record
 
     def delete_record(self, record_id: str) -> None:
-        self.records = [r for r in self.records if r.id != record_id]
+        record = self._by_id.pop(record_id, None)
+        if record is None:
+            return
+        del self.records[self._index_of(record)]
+        self._invalidate_aggregates()
+
+    def _index_of(self, record: Record) -> int:
+        """返回记录在 records 中的下标."""
+        key = _date_sort_key(record)
+        lo = bisect.bisect_left(self.records, key, key=_date_sort_key)
+        hi = bisect.bisect_right(self.records, key, lo=lo, key=_date_sort_key)
+        for index in range(lo, hi):
+            if self.records[index] is record:
+                return index
+        raise ValueError(f"记录不在列表中：{record.id}")
+
+    def _date_range(self, start_date: Optional[dt.date], end_date: Optional[dt.date]) -> Tuple[int, int]:
+        """返回日期落在 [start_date, end_date] 内的记录下标区间."""
+        lo = bisect.bisect_left(self.records, -end_date.toordinal(), key=_date_sort_key) if end_date else 0
+        hi = (
+            bisect.bisect_right(self.records, -start_date.toordinal(), key=_date_sort_key)
+            if start_date
+            else len(self.records)
+        )
+        return lo, hi
+
+    def _invalidate_aggregates(self) -> None:
+        self._trend_cache.clear()
+        self._breakdown_cache.clear()
 
     def find_record(self, record_id: str) -> Optional[Record]:
-        for record in self.records:
-            if record.id == record_id:
-                return record
-        return None
+        return self._by_id.get(record_id)
 
     def search_records(
         self,
@@ -118,74 +206,125 @@ class LedgerStore:
         min_amount: Optional[float] = None,
         max_amount: Optional[float] = None,
     ) -> List[Record]:
-        result: List[Record] = []
-        for record in self.records:
-            if start_date and record.date < start_date:
-                continue
-            if end_date and record.date > end_date:
-                continue
-            if category and record.category != category:
-                continue
-            if min_amount is not None and record.amount < min_amount:
-                continue
-            if max_amount is not None and record.amount > max_amount:
-                continue
-            result.append(record)
-        return sorted(result, key=lambda r: r.date, reverse=True)
+        lo, hi = self._date_range(start_date, end_date)
+        result: List[Record] = self.records[lo:hi]
+        if category:
+            result = [r for r in result if r.category == category]
+        if min_amount is not None:
+            result = [r for r in result if r.amount >= min_amount]
+        if max_amount is not None:
+            result = [r for r in result if r.amount <= max_amount]
+        return result
 
     def import_json(self, path: Path | str) -> None:
-        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        data = _loads(Path(path).read_bytes())
         categories = data.get("categories", [])
         self.categories.clear()
         for name, category_type in DEFAULT_CATEGORIES:
             self.categories[name] = category_type
         for item in categories:
             self.categories[item["name"]] = item.get("category_type", "expense")
-        self.records = [Record.from_dict(item) for item in data.get("records", [])]
+        self._sorted_categories = None
+        date_cache: Dict[str, dt.date] = {}
+        records: List[Record] = []
+        append = records.append
+        for item in data.get("records", []):
+            date_str = item["date"]
+            date = date_cache.get(date_str)
+            if date is None:
+                date = date_cache[date_str] = dt.date.fromisoformat(date_str)
+            append(Record.from_dict(item, date))
+        records.sort(key=_date_sort_key)
+        self.records = records
+        self._by_id = {record.id: record for record in self.records}
+        self._invalidate_aggregates()
 
-    def export_json(self, path: Path | str) -> None:
-        payload = {
+    def export_payload(self) -> Dict[str, list]:
+        return {
             "records": [record.to_dict() for record in self.records],
             "categories": [
                 {"name": name, "category_type": category_type}
                 for name, category_type in self.get_categories()
             ],
         }
-        Path(path).write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    def export_json(self, path: Path | str) -> None:
+        write_json(path, self.export_payload())
 
     def monthly_trend(self, months: int = 6) -> List[Tuple[str, float]]:
         """返回最近N个月的净收支."""
         today = dt.date.today()
-        base = dt.date(today.year, today.month, 1)
-        buckets: Dict[str, float] = {}
-        for i in range(months):
-            year = base.year
-            month = base.month - i
-            while month <= 0:
-                month += 12
-                year -= 1
-            key = f"{year:04d}-{month:02d}"
-            buckets[key] = 0.0
-        for record in self.records:
-            key = record.date.strftime("%Y-%m")
-            if key in buckets:
-                sign = 1 if record.category_type == "income" else -1
-                buckets[key] += record.amount * sign
-        ordered = sorted(buckets.items())
-        return ordered
+        cache_key = (today.toordinal(), months)
+        cached = self._trend_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        base_key = today.year * 12 + today.month - 1
+        target_keys = range(base_key - months + 1, base_key + 1)
+        if not target_keys:
+            return []
+        buckets: Dict[int, float] = dict.fromkeys(target_keys, 0.0)
+        first_key = target_keys[0]
+        window_start = dt.date(first_key // 12, first_key % 12 + 1, 1)
+        window_end = today.replace(day=calendar.monthrange(today.year, today.month)[1])
+        lo, hi = self._date_range(window_start, window_end)
+        for record in self.records[lo:hi]:
+            date = record.date
+            key = date.year * 12 + date.month - 1
+            buckets[key] += record.amount if record.category_type == "income" else -record.amount
+        ordered = [(f"{key // 12:04d}-{key % 12 + 1:02d}", buckets[key]) for key in target_keys]
+        self._trend_cache[cache_key] = ordered
+        return list(ordered)
 
     def current_month_breakdown(self, category_type: str = "expense") -> List[Tuple[str, float]]:
         today = dt.date.today()
-        buckets: Dict[str, float] = {}
-        for record in self.records:
-            if record.date.year == today.year and record.date.month == today.month:
-                if record.category_type != category_type:
-                    continue
-                buckets[record.category] = buckets.get(record.category, 0.0) + record.amount
-        return sorted(buckets.items(), key=lambda item: item[1], reverse=True)
+        cache_key = (today.toordinal(), category_type)
+        cached = self._breakdown_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        month_start = today.replace(day=1)
+        month_end = today.replace(day=calendar.monthrange(today.year, today.month)[1])
+        lo, hi = self._date_range(month_start, month_end)
+        buckets: DefaultDict[str, float] = defaultdict(float)
+        for record in self.records[lo:hi]:
+            if record.category_type == category_type:
+                buckets[record.category] += record.amount
+        ordered = sorted(buckets.items(), key=lambda item: item[1], reverse=True)
+        self._breakdown_cache[cache_key] = ordered
+        return list(ordered)
 
     def summary(self, start: Optional[dt.date] = None, end: Optional[dt.date] = None) -> Dict[str, float]:
-        records = self.search_records(start, end)
-        income = sum(r.amount for r in records if r.category_type == "income")
-        expense = sum(r.amount for r in records if r.category_type == "expense")
+        income = expense = 0.0
+        lo, hi = self._date_range(start, end)
+        for record in self.records[lo:hi]:
+            if record.category_type == "income":
+                income += record.amount
+            elif record.category_type == "expense":
+                expense += record.amount
         return {"income": income, "expense": expense, "balance": income - expense}
+
+
+# 进程的 umask 只能通过设置来读取，在导入时（主线程）读取一次
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def write_json(path: Path | str, payload: Dict[str, list]) -> None:
+    """先写临时文件再替换，避免写入中途中断损坏原文件."""
+    path = Path(path)
+    data = _dumps(payload)
+    tmp = tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False)
+    try:
+        with tmp:
+            tmp.write(data)
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp.name, mode)
+        os.replace(tmp.name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp.name)
+        except OSError:
+            pass
+        raise